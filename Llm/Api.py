@@ -0,0 +1,188 @@
+import os
+from asyncio import Lock, Queue, Task, get_running_loop, sleep, wait_for
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Mapping
+
+import torch
+
+from .models.ModelBase import ModelBase
+from .models.impl.CodeLLama_xB_Instruct import CodeLLama_xB_Instruct
+from .models.impl.Gemma_7B_Instruct import Gemma_7B_Instruct
+from .models.impl.LLama2_xB_Chat import LLama2_xB_Chat
+from .models.impl.Mistral8x7BInstructV01 import Mistral8x7BInstructV01
+from .models.impl.VLLMBacked import VLLMBacked
+
+_MODEL_REGISTRY: dict[str, type[ModelBase]] = {
+    cls.__name__: cls for cls in (
+        Mistral8x7BInstructV01, LLama2_xB_Chat, CodeLLama_xB_Instruct,
+        Gemma_7B_Instruct)}
+
+_VLLM_MODEL_IDS: Mapping[str, str] = {
+    Mistral8x7BInstructV01.__name__: Mistral8x7BInstructV01.model_id,
+    LLama2_xB_Chat.__name__: LLama2_xB_Chat.model_id_format.format(b=70),
+    CodeLLama_xB_Instruct.__name__:
+        CodeLLama_xB_Instruct.model_id_format.format(b=34),
+    Gemma_7B_Instruct.__name__: Gemma_7B_Instruct.model_id}
+
+
+class Api:
+    """
+    Serves the locally hosted models. Models are constructed lazily on
+    first use; construction of each model is guarded by a per-model
+    asyncio lock, so that concurrent first requests do not load the same
+    weights twice and the event loop is never blocked by a loading (or
+    generating) model. Generation itself runs concurrently on a shared,
+    bounded thread pool, so that overlapping requests can be scheduled
+    by the underlying inference runtime.
+    """
+
+    available_models: list[str] = list(_MODEL_REGISTRY)
+
+    def __init__(self, dev: str = 'cuda', max_batch: int = 32,
+                 batch_timeout: float = 0.02,
+                 backend: Literal['transformers', 'vllm'] = 'transformers',
+                 preload: bool = False,
+                 idle_window: float = 30.0) -> None:
+        os.environ.setdefault(
+            'PYTORCH_CUDA_ALLOC_CONF',
+            'expandable_segments:True,max_split_size_mb:512')
+        self.dev = dev
+        self.backend = backend
+        self.max_batch = max_batch
+        self.batch_timeout = batch_timeout
+        self.models: dict[str, ModelBase] = {}
+        self._load_locks: dict[str, Lock] = {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, torch.cuda.device_count()))
+        self._queues: dict[str, Queue] = {}
+        self._workers: dict[str, Task] = {}
+        self._idle_window = idle_window
+        self._last_active = 0.0
+        self._gc_task: Task = None
+        if preload:
+            self._preload()
+
+    def _preload(self) -> None:
+        """
+        Loads all available models concurrently, so that no request has
+        to wait behind a cold start. Loading through huggingface
+        releases the GIL during the disk-to-device copy (safetensors are
+        memory-mapped), so the loads genuinely overlap.
+        """
+        with ThreadPoolExecutor(
+                max_workers=len(Api.available_models)) as pool:
+            for model, instance in zip(Api.available_models, pool.map(
+                    self._build_model, Api.available_models)):
+                self.models[model] = instance
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _build_model(self, model: str) -> ModelBase:
+        """
+        Constructs the requested model for the configured backend. This
+        blocks until the weights are loaded and should therefore run on
+        a worker thread.
+        """
+        if self.backend == 'vllm':
+            return VLLMBacked(dev=self.dev, model_id=_VLLM_MODEL_IDS[model])
+        return _MODEL_REGISTRY[model](dev=self.dev)
+
+    async def _get_model(self, model: str) -> ModelBase:
+        """
+        Lazily constructs (and then re-uses) the requested model. The
+        per-model lock is created inside the running loop on first use;
+        while one request loads the weights on the thread pool, other
+        requests for the same model wait on the lock without blocking
+        the event loop.
+        """
+        if model not in _MODEL_REGISTRY:
+            raise KeyError(
+                f'Unknown model: {model}. Available models are: '
+                f'{", ".join(_MODEL_REGISTRY)}.')
+        if model in self.models:
+            return self.models[model]
+        async with self._load_locks.setdefault(model, Lock()):
+            if model not in self.models:
+                self.models[model] = await get_running_loop().run_in_executor(
+                    self._pool, self._build_model, model)
+        return self.models[model]
+
+    def _ensure_worker(self, model: str) -> None:
+        """
+        Starts the batching worker for the given model on first use and
+        restarts it, should it ever have died, keeping the existing
+        queue (and whatever is still waiting in it).
+        """
+        worker = self._workers.get(model)
+        if worker is None or worker.done():
+            if model not in self._queues:
+                self._queues[model] = Queue()
+            self._workers[model] = get_running_loop().create_task(
+                self._batch_worker(model))
+        if self._gc_task is None:
+            self._gc_task = get_running_loop().create_task(self._cache_gc())
+
+    async def _batch_worker(self, model: str) -> None:
+        """
+        Collects queued prompts for one model into batches of up to
+        ``max_batch`` items (or whatever arrived within
+        ``batch_timeout`` after the first item) and answers each batch
+        through a single generate call.
+        """
+        queue = self._queues[model]
+        loop = get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await wait_for(queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+
+            try:
+                instance = await self._get_model(model)
+                results = await loop.run_in_executor(
+                    self._pool, instance.prompt_batch,
+                    [prompt for prompt, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as ex:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(ex)
+            finally:
+                self._last_active = loop.time()
+
+    async def _cache_gc(self) -> None:
+        """
+        Returns reserved but unused device memory to the driver whenever
+        the Api has been idle for at least ``idle_window`` seconds.
+        Workloads with varying prompt lengths otherwise leave the
+        caching allocator fragmented enough to OOM later batches, even
+        at lower actual memory use.
+        """
+        loop = get_running_loop()
+        while True:
+            await sleep(self._idle_window)
+            if (torch.cuda.is_available()
+                    and loop.time() - self._last_active >= self._idle_window
+                    and all(q.empty() for q in self._queues.values())):
+                torch.cuda.empty_cache()
+
+    async def prompt_model(self, model: str, prompt: str) -> str:
+        """
+        Prompts the given model and returns the generated answer.
+        Prompts are queued per model and flushed in dynamic batches, so
+        concurrent requests share one generate call. The blocking
+        generation runs on the shared thread pool, so the event loop
+        stays responsive.
+        """
+        future = get_running_loop().create_future()
+        self._ensure_worker(model)
+        self._queues[model].put_nowait((prompt, future))
+        return await future
@@ -0,0 +1,216 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Literal
+
+import torch
+from transformers import AutoTokenizer, BitsAndBytesConfig, DynamicCache
+
+_SPLIT_RE = re.compile(
+    "Rules\n=====|The Summary of the Commit\n=+|"
+    "The Commit's affected files\n=+|Result\n======")
+
+
+@dataclass
+class SplitPrompt:
+    """
+    Holds the five sections that every raw prompt handed to a model
+    consists of (see the templates used by the GitTools exporter).
+    """
+    Instructions: str
+    Rules: str
+    Summary: str
+    AffectedFiles: str
+    Result: str
+
+
+def quantization_kwargs(quant: Literal['nf4', 'int8', 'fp16']) -> dict[str, Any]:
+    """
+    Maps the requested weight format to the corresponding keyword
+    arguments for ``from_pretrained``. 'nf4' and 'int8' quantize through
+    bitsandbytes; 'fp16' loads the unquantized half-precision weights.
+    """
+    if quant == 'nf4':
+        return {'quantization_config': BitsAndBytesConfig(
+            load_in_4bit=True, bnb_4bit_quant_type='nf4',
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_use_double_quant=True)}
+    if quant == 'int8':
+        return {'quantization_config': BitsAndBytesConfig(load_in_8bit=True)}
+    if quant == 'fp16':
+        return {'torch_dtype': torch.float16}
+    raise ValueError(f'Unknown weight format: {quant}')
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_id: str) -> AutoTokenizer:
+    """
+    Constructs (and then re-uses) the tokenizer for the given model id,
+    so that repeated model instantiations share one instance. Pads on
+    the left (with the eos token, if the model has no pad token), so
+    that batched generation continues from the actual last token of
+    every sequence.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    tokenizer.padding_side = 'left'
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+class ModelBase(ABC):
+    """
+    Abstract base class for all locally served models. A concrete model
+    knows how to assemble its own chat/instruction format from a
+    :class:`SplitPrompt` and how to generate an answer for it.
+    """
+
+    # Whether _batch_text returns rendered chat-template text, which
+    # already contains the literal special tokens and must not have
+    # another bos prepended by the tokenizer.
+    _batch_text_rendered: bool = False
+
+    def __init__(self, dev: str) -> None:
+        self.dev = dev
+        self._prefix_cache: dict[bytes, tuple] = {}
+        self._prefix_ids: dict[bytes, torch.Tensor] = {}
+
+    @staticmethod
+    def split_prompt(prompt: str) -> SplitPrompt:
+        """
+        Splits a raw prompt into its five sections, using the headlines
+        that separate them as delimiters.
+        """
+        parts = _SPLIT_RE.split(prompt)
+        return SplitPrompt(*(part.strip() for part in parts))
+
+    @abstractmethod
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        """
+        Generates and returns an answer for the given raw prompt.
+        """
+
+    def _compile_model(self, static_cache: bool = True) -> None:
+        """
+        Compiles the model's forward with CUDA-graph capture
+        ('reduce-overhead'), which removes the per-step kernel launch
+        overhead of the tiny decode kernels. The forward is compiled in
+        place (wrapping the whole module would leave generate, which
+        delegates to the original module, running uncompiled). With
+        ``static_cache``, generate additionally uses the static KV-cache
+        implementation, so captured graphs are re-used across decode
+        steps; models whose prompt path supplies its own past_key_values
+        (see :meth:`generate_with_prefix`) must disable it, since
+        generate rejects both at once.
+        """
+        if static_cache:
+            self.model.generation_config.cache_implementation = 'static'
+        self.model.forward = torch.compile(
+            self.model.forward, mode='reduce-overhead', fullgraph=False)
+
+    def _batch_text(self, prompt: str, include_rules: bool = True) -> str:
+        """
+        Assembles the final, ready-to-tokenize text for a single prompt
+        of a batch. The default is the plain instruction format; models
+        that require a chat template override this.
+        """
+        sp = self.split_prompt(prompt)
+        rules = f'Rules\n=====\n\n{sp.Rules}\n\n' if include_rules else ''
+        return (
+            f'{sp.Instructions}\n\n{rules}'
+            f'The Summary of the Commit\n=========================\n\n{sp.Summary}\n\n'
+            f"The Commit's affected files\n===========================\n\n{sp.AffectedFiles}\n\n"
+            'Report the percentages for each of the three maintenance '
+            'activities as instructed.')
+
+    def _to_device(self, enc) -> dict[str, torch.Tensor]:
+        """
+        Moves tokenizer output to the model's device. On CUDA devices
+        the tensors are staged through pinned host memory and copied
+        without blocking, so the transfer can overlap with whatever the
+        GPU is still working on.
+        """
+        if torch.cuda.is_available() and str(self.dev).startswith('cuda'):
+            return {k: v.pin_memory().to(self.dev, non_blocking=True)
+                    for k, v in enc.items()}
+        return {k: v.to(self.dev) for k, v in enc.items()}
+
+    def _template_ids(self, text: str) -> torch.Tensor:
+        """
+        Tokenizes a fully rendered chat text, re-using cached ids for
+        its static head — everything before the summary headline, i.e.
+        the template delimiters, instructions and rules shared by all
+        prompts. The head is tokenized once per unique text (keyed by a
+        blake2b hash); only the short dynamic tail is tokenized per
+        call. Rendered text already contains the literal special tokens,
+        so the tokenizer must not prepend another bos.
+        """
+        at = text.find('The Summary of the Commit')
+        if at < 0:
+            return self._to_device(self.tokenizer(
+                text, add_special_tokens=False,
+                return_tensors='pt'))['input_ids']
+
+        head, tail = text[:at], text[at:]
+        key = hashlib.blake2b(head.encode('utf-8')).digest()
+        if key not in self._prefix_ids:
+            self._prefix_ids[key] = self._to_device(self.tokenizer(
+                head, add_special_tokens=False,
+                return_tensors='pt'))['input_ids']
+        tail_ids = self._to_device(self.tokenizer(
+            tail, add_special_tokens=False,
+            return_tensors='pt'))['input_ids']
+        return torch.cat([self._prefix_ids[key], tail_ids], dim=-1)
+
+    def generate_with_prefix(self, prefix: str, suffix: str, **gen_kwargs) -> str:
+        """
+        Generates an answer for prefix + suffix, re-using the cached
+        key/value states of the (static) prefix. The prefix — typically
+        the instructions and rules shared by all prompts — is pre-filled
+        only once per unique text and its K/V states are kept per model,
+        keyed by a blake2b hash; subsequent requests only pre-fill the
+        (much shorter) suffix.
+        """
+        key = hashlib.blake2b(prefix.encode('utf-8')).digest()
+        if key not in self._prefix_cache:
+            prefix_ids = self._to_device(
+                self.tokenizer(prefix, return_tensors='pt'))['input_ids']
+            with torch.inference_mode():
+                past = self.model(prefix_ids, use_cache=True).past_key_values
+            if isinstance(past, DynamicCache):
+                past = past.to_legacy_cache()
+            self._prefix_cache[key] = (prefix_ids, past)
+
+        prefix_ids, past = self._prefix_cache[key]
+        suffix_ids = self._to_device(self.tokenizer(
+            suffix, add_special_tokens=False,
+            return_tensors='pt'))['input_ids']
+        with torch.inference_mode():
+            output = self.model.generate(
+                input_ids=torch.cat([prefix_ids, suffix_ids], dim=-1),
+                past_key_values=DynamicCache.from_legacy_cache(past),
+                **gen_kwargs)
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)[0]
+
+    def prompt_batch(self, prompts: list[str], include_rules: bool = True) -> list[str]:
+        """
+        Generates answers for a whole batch of raw prompts through a
+        single padded generate call, which amortizes the per-step weight
+        loads across all prompts of the batch.
+        """
+        texts = [self._batch_text(p, include_rules=include_rules) for p in prompts]
+        enc = self._to_device(self.tokenizer(
+            texts, padding=True,
+            add_special_tokens=not self._batch_text_rendered,
+            return_tensors='pt'))
+        with torch.inference_mode():
+            output = self.model.generate(
+                input_ids=enc['input_ids'],
+                attention_mask=enc['attention_mask'],
+                max_new_tokens=200, do_sample=True, temperature=0.3)
+        # With left padding, all prompts end at the same offset, so the
+        # newly generated tokens are everything past the padded length.
+        return self.tokenizer.batch_decode(
+            output[:, enc['input_ids'].shape[1]:], skip_special_tokens=True)
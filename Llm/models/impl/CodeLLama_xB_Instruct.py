@@ -0,0 +1,50 @@
+from typing import Literal
+
+import torch
+from transformers import AutoModelForCausalLM
+
+from ..ModelBase import ModelBase, get_tokenizer, quantization_kwargs
+
+
+class CodeLLama_xB_Instruct(ModelBase):
+    """
+    CodeLlama (instruction-tuned), served through huggingface
+    transformers. The parameter count is configurable, since the model
+    is available in multiple sizes. Weights are 4-bit quantized by
+    default, since the larger sizes do not fit common GPUs in fp16.
+    """
+
+    model_id_format = 'codellama/CodeLlama-{b}b-Instruct-hf'
+    _batch_text_rendered = True
+
+    def __init__(self, dev: str, b: int = 34,
+                 quant: Literal['nf4', 'int8', 'fp16'] = 'nf4') -> None:
+        super().__init__(dev=dev)
+        self.b = b
+        self.model_id = self.model_id_format.format(b=b)
+        self.tokenizer = get_tokenizer(self.model_id)
+        self.model = AutoModelForCausalLM.from_pretrained(
+            self.model_id, device_map='auto', **quantization_kwargs(quant))
+        self.model.eval()
+        self._compile_model()
+
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        inputs = self._template_ids(
+            self._batch_text(prompt, include_rules=include_rules))
+        with torch.inference_mode():
+            output = self.model.generate(
+                inputs, max_new_tokens=200, do_sample=True, temperature=0.3)
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)[0]
+
+    def _batch_text(self, prompt: str, include_rules: bool = True) -> str:
+        sp = self.split_prompt(prompt)
+        rules = f'\n\nRules\n=====\n\n{sp.Rules}\n\n' if include_rules else ''
+        messages = [
+            {'role': 'system', 'content': (
+                f'{sp.Instructions}{rules}'
+                f'The Summary of the Commit\n=========================\n\n{sp.Summary}\n\n'
+                f"The Commit's affected files\n===========================\n\n{sp.AffectedFiles}")},
+            {'role': 'user', 'content': 'Report the percentages for each of '
+                'the three maintenance activities as instructed.'}]
+        return self.tokenizer.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True)
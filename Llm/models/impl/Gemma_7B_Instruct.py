@@ -0,0 +1,36 @@
+import torch
+from transformers import AutoModelForCausalLM
+
+from ..ModelBase import ModelBase, get_tokenizer
+
+
+class Gemma_7B_Instruct(ModelBase):
+    """
+    Gemma 7B (instruction-tuned), served through huggingface
+    transformers with FlashAttention-2.
+    """
+
+    model_id = 'google/gemma-7b-it'
+
+    def __init__(self, dev: str) -> None:
+        super().__init__(dev=dev)
+        self.tokenizer = get_tokenizer(self.model_id)
+        self.model = AutoModelForCausalLM.from_pretrained(
+            self.model_id, torch_dtype=torch.bfloat16,
+            attn_implementation='flash_attention_2', device_map={'': dev})
+        self.model.eval()
+        self._compile_model(static_cache=False)
+
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        sp = self.split_prompt(prompt)
+
+        rules = f'Rules\n=====\n\n{sp.Rules}\n\n' if include_rules else ''
+        prefix = f'{sp.Instructions}\n\n{rules}'
+        suffix = (
+            f'The Summary of the Commit\n=========================\n\n{sp.Summary}\n\n'
+            f"The Commit's affected files\n===========================\n\n{sp.AffectedFiles}\n\n"
+            'Report the percentages for each of the three maintenance '
+            'activities as instructed.')
+
+        return self.generate_with_prefix(
+            prefix, suffix, max_new_tokens=200, do_sample=True, temperature=0.3)
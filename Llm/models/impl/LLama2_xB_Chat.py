@@ -0,0 +1,45 @@
+from typing import Literal
+
+import transformers
+from transformers import LlamaForCausalLM
+
+from ..ModelBase import ModelBase, get_tokenizer, quantization_kwargs
+
+
+class LLama2_xB_Chat(ModelBase):
+    """
+    Llama-2 chat, served through a huggingface text-generation pipeline.
+    The parameter count is configurable, since the model is available in
+    multiple sizes. Weights are 4-bit quantized by default, since the
+    larger sizes do not fit common GPUs in fp16.
+    """
+
+    model_id_format = 'meta-llama/Llama-2-{b}b-chat-hf'
+
+    def __init__(self, dev: str, b: int = 70,
+                 quant: Literal['nf4', 'int8', 'fp16'] = 'nf4') -> None:
+        super().__init__(dev=dev)
+        self.b = b
+        self.model_id = self.model_id_format.format(b=b)
+        self.tokenizer = get_tokenizer(self.model_id)
+        self.model = LlamaForCausalLM.from_pretrained(
+            self.model_id, device_map='auto', **quantization_kwargs(quant))
+        self.model.eval()
+        self._compile_model()
+        self.pipeline = transformers.pipeline(
+            task='text-generation', model=self.model, tokenizer=self.tokenizer)
+
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        sp = self.split_prompt(prompt)
+
+        rules = f'Rules\n=====\n\n{sp.Rules}\n\n' if include_rules else ''
+        use_prompt = (
+            f'{sp.Instructions}\n\n{rules}'
+            f'The Summary of the Commit\n=========================\n\n{sp.Summary}\n\n'
+            f"The Commit's affected files\n===========================\n\n{sp.AffectedFiles}\n\n"
+            'Report the percentages for each of the three maintenance '
+            'activities as instructed.')
+
+        return self.pipeline(
+            use_prompt, do_sample=True, temperature=0.3, max_new_tokens=200,
+            return_full_text=False)[0]['generated_text']
@@ -0,0 +1,38 @@
+import torch
+from transformers import AutoModelForCausalLM
+
+from ..ModelBase import ModelBase, get_tokenizer
+
+
+class Mistral8x7BInstructV01(ModelBase):
+    """
+    Mixtral 8x7B (instruction-tuned), served through huggingface
+    transformers. Uses the model's chat template for assembling the
+    conversation.
+    """
+
+    model_id = 'mistralai/Mixtral-8x7B-Instruct-v0.1'
+    _batch_text_rendered = True
+
+    def __init__(self, dev: str) -> None:
+        super().__init__(dev=dev)
+        self.tokenizer = get_tokenizer(self.model_id)
+        self.model = AutoModelForCausalLM.from_pretrained(
+            self.model_id, torch_dtype=torch.bfloat16, device_map='auto',
+            low_cpu_mem_usage=True, attn_implementation='flash_attention_2')
+        self.model.eval()
+        self._compile_model()
+
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        inputs = self._template_ids(
+            self._batch_text(prompt, include_rules=include_rules))
+        with torch.inference_mode():
+            output = self.model.generate(
+                inputs, max_new_tokens=200, do_sample=True, temperature=0.3)
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)[0]
+
+    def _batch_text(self, prompt: str, include_rules: bool = True) -> str:
+        return self.tokenizer.apply_chat_template(
+            [{'role': 'user', 'content': super()._batch_text(
+                prompt, include_rules=include_rules)}],
+            tokenize=False, add_generation_prompt=True)
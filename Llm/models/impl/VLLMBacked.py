@@ -0,0 +1,46 @@
+from ..ModelBase import ModelBase, get_tokenizer
+
+
+class VLLMBacked(ModelBase):
+    """
+    Serves any of the hosted models through vLLM instead of plain
+    transformers. vLLM's PagedAttention packs sequences of different
+    lengths without padding waste, batches continuously at iteration
+    level, and re-uses the KV cache of shared prompt prefixes. Requires
+    the optional vllm package.
+    """
+
+    def __init__(self, dev: str, model_id: str) -> None:
+        super().__init__(dev=dev)
+        from vllm import LLM, SamplingParams
+        self.model_id = model_id
+        self.tokenizer = get_tokenizer(model_id)
+        self.engine = LLM(
+            model=model_id, dtype='bfloat16', max_num_seqs=256,
+            enable_prefix_caching=True)
+        self._sampling = SamplingParams(max_tokens=200, temperature=0.3)
+
+    def _batch_text(self, prompt: str, include_rules: bool = True) -> str:
+        text = super()._batch_text(prompt, include_rules=include_rules)
+        if self.tokenizer.chat_template is None:
+            return text
+        return self.tokenizer.apply_chat_template(
+            [{'role': 'user', 'content': text}], tokenize=False,
+            add_generation_prompt=True)
+
+    def prompt(self, prompt: str, include_rules: bool = True) -> str:
+        return self.prompt_batch([prompt], include_rules=include_rules)[0]
+
+    def prompt_batch(self, prompts: list[str], include_rules: bool = True) -> list[str]:
+        from vllm import TokensPrompt
+        texts = [self._batch_text(p, include_rules=include_rules) for p in prompts]
+        # Chat-template output already contains the literal special
+        # tokens; tokenize here instead of in the engine, which would
+        # prepend a second bos. The plain-text fallback (no template)
+        # still needs them added.
+        enc = self.tokenizer(
+            texts, add_special_tokens=self.tokenizer.chat_template is None)
+        outputs = self.engine.generate(
+            [TokensPrompt(prompt_token_ids=ids) for ids in enc.input_ids],
+            self._sampling)
+        return [output.outputs[0].text for output in outputs]